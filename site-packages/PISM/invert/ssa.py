@@ -345,14 +345,16 @@ def createGradientFunctionals(ssarun):
     useGroundedIceOnly = PISM.OptionBool("-inv_ssa_grounded_ice_tauc",
                                          "Computed norms for tau_c only on elements with all grounded ice.")
 
-    misfit_type = grid.ctx().config().get_string("inverse.state_func")
+    config = grid.ctx().config()
+
+    misfit_type = config.get_string("inverse.state_func")
     if misfit_type != 'meansquare':
-        inv_method = grid.ctx().config().get_string("inverse.ssa.method")
+        inv_method = config.get_string("inverse.ssa.method")
         raise Exception("'-inv_state_func %s' is not supported with '-inv_method %s'.\nUse '-inv_state_func meansquare' instead" % (misfit_type, inv_method))
 
-    design_functional = grid.ctx().config().get_string("inverse.design.func")
+    design_functional = config.get_string("inverse.design.func")
     if design_functional != "sobolevH1":
-        inv_method = grid.ctx().config().get_string("inverse.ssa.method")
+        inv_method = config.get_string("inverse.ssa.method")
         raise Exception("'-inv_design_func %s' is not supported with '-inv_method %s'.\nUse '-inv_design_func sobolevH1' instead" % (design_functional, inv_method))
 
     designFunctional = createHilbertDesignFunctional(grid, vecs, useGroundedIceOnly)
@@ -458,11 +460,13 @@ def createHilbertDesignFunctional(grid, vecs, useGroundedIceOnly):
     :param vecs: model vecs
     :param useGroundedIceOnly: flag, ``True`` if a :cpp:class`IPGroundedIceH1NormFunctional2S` should be created.
   """
-    cL2 = grid.ctx().config().get_number("inverse.design.cL2")
-    cH1 = grid.ctx().config().get_number("inverse.design.cH1")
+    config = grid.ctx().config()
+
+    cL2 = config.get_number("inverse.design.cL2")
+    cH1 = config.get_number("inverse.design.cH1")
 
     area = 4 * grid.Lx() * grid.Ly()
-    length_scale = grid.ctx().config().get_number("inverse.ssa.length_scale")
+    length_scale = config.get_number("inverse.ssa.length_scale")
     cL2 /= area
     cH1 /= area
     cH1 *= (length_scale * length_scale)
@@ -512,6 +516,7 @@ class RMSMisfitReporter(object):
     "Report RMS misfit."
     def __init__(self):
         self.J = None
+        self.velocity_scale = None
 
     def __call__(self, invssa_solver, it, data):
 
@@ -520,9 +525,10 @@ class RMSMisfitReporter(object):
         if self.J is None:
             vecs = invssa_solver.ssarun.modeldata.vecs
             self.J = createMeanSquareMisfitFunctional(grid, vecs)
+            self.velocity_scale = grid.ctx().config().get_number("inverse.ssa.velocity_scale")
 
         Jmisfit = self.J.valueAt(data.residual)
-        rms_misfit = math.sqrt(Jmisfit) * grid.ctx().config().get_number("inverse.ssa.velocity_scale")
+        rms_misfit = math.sqrt(Jmisfit) * self.velocity_scale
 
         PISM.logging.logMessage("Diagnostic RMS Misfit: %0.8g (m/a)\n" % rms_misfit)
 
@@ -532,6 +538,7 @@ class MisfitLogger(object):
     def __init__(self):
         self.misfit_history = []
         self.misfit_type = None
+        self.velocity_scale = None
 
     def __call__(self, invssa_solver, it, data):
         """
@@ -543,7 +550,9 @@ class MisfitLogger(object):
         grid = invssa_solver.ssarun.grid
 
         if self.misfit_type is None:
-            self.misfit_type = grid.ctx().config().get_string("inverse.state_func")
+            config = grid.ctx().config()
+            self.misfit_type = config.get_string("inverse.state_func")
+            self.velocity_scale = config.get_number("inverse.ssa.velocity_scale")
 
         method = invssa_solver.method
         if method == 'ign' or method == 'sd' or method == 'nlcg':
@@ -557,9 +566,7 @@ class MisfitLogger(object):
             raise RuntimeError("Unable to report misfits for inversion method: %s" % method)
 
         if self.misfit_type == "meansquare":
-            velScale_m_per_year = grid.ctx().config().get_number("inverse.ssa.velocity_scale")
-
-            rms_misfit = math.sqrt(Jmisfit) * velScale_m_per_year
+            rms_misfit = math.sqrt(Jmisfit) * self.velocity_scale
 
             logMessage("Misfit: sqrt(J_misfit) = %.8g (m/a)\n" % rms_misfit)
             self.misfit_history.append(rms_misfit)
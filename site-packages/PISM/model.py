@@ -75,9 +75,10 @@ class ModelVecs(object):
         s = 'ModelVecs:\n'
         items = [(key, self._vecs.get(key)) for key in list(self._vecs.keys())]
         for (key, value) in items:
-            short_name = value.metadata().get_string("short_name")
-            long_name = value.metadata().get_string("long_name")
-            standard_name = value.metadata().get_string("standard_name")
+            metadata = value.metadata()
+            short_name = metadata.get_string("short_name")
+            long_name = metadata.get_string("long_name")
+            standard_name = metadata.get_string("standard_name")
 
             if key != short_name or len(standard_name) == 0:
                 # alternative name was given, so we can't look up by standard name
@@ -350,8 +351,9 @@ def createIceThicknessVec(grid, name='thk', ghost_type=PISM.WITH_GHOSTS, stencil
 
     thickness = _scalar_vec(grid, name, stencil_width)
 
-    thickness.metadata(0).long_name("land ice thickness").units("m").standard_name("land_ice_thickness")
-    thickness.metadata().set_number("valid_min", 0.0)
+    metadata = thickness.metadata()
+    metadata.long_name("land ice thickness").units("m").standard_name("land_ice_thickness")
+    metadata.set_number("valid_min", 0.0)
 
     return thickness
 
@@ -486,10 +488,11 @@ def createAveragedHardnessVec(grid, name='hardav', desc="vertical average of ice
 
     hardav = _scalar_vec(grid, name, stencil_width)
 
-    hardav.metadata().long_name(desc).set_units_without_validation("Pa s^(1/n)")
-    hardav.metadata().set_number("valid_min", 0.0)
-    hardav.metadata().set_string("comment",
-                                 "units depend on the Glen exponent used by the flow law")
+    metadata = hardav.metadata()
+    metadata.long_name(desc).set_units_without_validation("Pa s^(1/n)")
+    metadata.set_number("valid_min", 0.0)
+    metadata.set_string("comment",
+                        "units depend on the Glen exponent used by the flow law")
 
     return hardav
 
@@ -599,9 +602,10 @@ def createBasalMeltRateVec(grid, name='bmelt', ghost_type=PISM.WITH_GHOSTS, sten
 
     bmr = _scalar_vec(grid, name, stencil_width)
 
-    bmr.metadata(0).long_name("ice basal melt rate in ice thickness per time").units("m s^-1").output_units("m year^-1").standard_name("land_ice_basal_melt_rate")
+    metadata = bmr.metadata()
+    metadata.long_name("ice basal melt rate in ice thickness per time").units("m s^-1").output_units("m year^-1").standard_name("land_ice_basal_melt_rate")
 
-    bmr.metadata().set_string("comment", "positive basal melt rate corresponds to ice loss")
+    metadata.set_string("comment", "positive basal melt rate corresponds to ice loss")
     return bmr
 
 
@@ -659,8 +663,9 @@ def createBasalWaterVec(grid, name='tillwat', desc="effective thickness of subgl
     tillwat = _scalar_vec(grid, name, stencil_width)
     valid_max = PISM.Context().config.get_number("hydrology.tillwat_max")
 
-    tillwat.metadata().long_name(desc).units("m")
-    tillwat.metadata().set_numbers("valid_range", [0.0, valid_max])
+    metadata = tillwat.metadata()
+    metadata.long_name(desc).units("m")
+    metadata.set_numbers("valid_range", [0.0, valid_max])
     return tillwat
 
 
@@ -687,8 +692,9 @@ def createGroundingLineMask(grid, name='gl_mask', desc="fractional floatation ma
 
     gl_mask = _scalar_vec(grid, name, stencil_width)
 
-    gl_mask.metadata().long_name(desc).units("1")
-    gl_mask.metadata().set_numbers("valid_range", [0.0, 1.0])
+    metadata = gl_mask.metadata()
+    metadata.long_name(desc).units("1")
+    metadata.set_numbers("valid_range", [0.0, 1.0])
     return gl_mask
 
 
@@ -712,15 +718,15 @@ def create2dVelocityVec(grid, name="", desc="", ghost_type=PISM.WITH_GHOSTS, ste
     stencil_width = _stencil_width(grid, ghost_type, stencil_width)
 
     vel = _velocity_vec(grid, name, stencil_width)
-    vel.metadata(0).long_name("X-component of the %s" % desc)
-    vel.metadata(1).long_name("Y-component of the %s" % desc)
 
     huge_vel = convert(1e10, "m/year", "m/second")
     attrs = [("valid_min", -huge_vel), ("valid_max", huge_vel), ("_FillValue", 2 * huge_vel)]
-    for component in [0, 1]:
-        vel.metadata(component).units("m s^-1").output_units("m year^-1")
+    for component, direction in [(0, "X"), (1, "Y")]:
+        metadata = vel.metadata(component)
+        metadata.long_name("%s-component of the %s" % (direction, desc))
+        metadata.units("m s^-1").output_units("m year^-1")
         for a in attrs:
-            vel.metadata(component).set_number(a[0], a[1])
+            metadata.set_number(a[0], a[1])
     vel.set(2 * huge_vel)
     return vel
 
@@ -830,9 +836,10 @@ def createCBarVec(grid, name="velbar_mag", ghost_type=PISM.WITHOUT_GHOSTS, stenc
 
     velbar_mag = _scalar_vec(grid, name, stencil_width)
 
-    velbar_mag.metadata(0).long_name("magnitude of vertically-integrated horizontal velocity of ice").units("m s^-1").output_units("m year^-1")
+    metadata = velbar_mag.metadata()
+    metadata.long_name("magnitude of vertically-integrated horizontal velocity of ice").units("m s^-1").output_units("m year^-1")
 
-    velbar_mag.metadata().set_number("valid_min", 0.0)
+    metadata.set_number("valid_min", 0.0)
 
     return velbar_mag
 
@@ -859,12 +866,13 @@ def createIceMaskVec(grid, name='mask', ghost_type=PISM.WITH_GHOSTS, stencil_wid
 
     ice_mask = _cell_type_vec(grid, name, stencil_width)
 
-    ice_mask.metadata(0).long_name("grounded_dragging_floating integer mask")
+    metadata = ice_mask.metadata()
+    metadata.long_name("grounded_dragging_floating integer mask")
     mask_values = [PISM.MASK_ICE_FREE_BEDROCK, PISM.MASK_GROUNDED, PISM.MASK_FLOATING,
                    PISM.MASK_ICE_FREE_OCEAN]
-    ice_mask.metadata().set_numbers("flag_values", mask_values)
-    ice_mask.metadata().set_string("flag_meanings",
-                                   "ice_free_bedrock dragging_sheet floating ice_free_ocean")
+    metadata.set_numbers("flag_values", mask_values)
+    metadata.set_string("flag_meanings",
+                        "ice_free_bedrock dragging_sheet floating ice_free_ocean")
     return ice_mask
 
 
@@ -889,9 +897,10 @@ def createBCMaskVec(grid, name='vel_bc_mask', ghost_type=PISM.WITH_GHOSTS, stenc
     stencil_width = _stencil_width(grid, ghost_type, stencil_width)
 
     vel_bc_mask = _scalar_vec(grid, name, stencil_width)
-    vel_bc_mask.metadata(0).long_name("mask defining locations of velocity boundary conditions")
-    vel_bc_mask.metadata().set_numbers("flag_values", [0, 1])
-    vel_bc_mask.metadata().set_string("flag_meanings", "no_data ssa.dirichlet_bc_location")
+    metadata = vel_bc_mask.metadata()
+    metadata.long_name("mask defining locations of velocity boundary conditions")
+    metadata.set_numbers("flag_values", [0, 1])
+    metadata.set_string("flag_meanings", "no_data ssa.dirichlet_bc_location")
 
     return vel_bc_mask
 
@@ -920,11 +929,12 @@ def createNoModelMaskVec(grid, name='no_model_mask', ghost_type=PISM.WITH_GHOSTS
 
     no_model_mask = _scalar_vec(grid, name, stencil_width)
 
-    no_model_mask.metadata(0).long_name("mask: zeros (modeling domain) and ones (no-model buffer near grid edges)")
+    metadata = no_model_mask.metadata()
+    metadata.long_name("mask: zeros (modeling domain) and ones (no-model buffer near grid edges)")
 
     mask_values = [0, 1]
-    no_model_mask.metadata().set_numbers("flag_values", mask_values)
-    no_model_mask.metadata().set_string("flag_meanings", "normal special_treatment")
+    metadata.set_numbers("flag_values", mask_values)
+    metadata.set_string("flag_meanings", "normal special_treatment")
     no_model_mask.time_independent = True
     no_model_mask.set(0)
     return no_model_mask
@@ -954,10 +964,11 @@ def createZetaFixedMaskVec(grid, name='zeta_fixed_mask', ghost_type=PISM.WITH_GH
 
     zeta_fixed_mask = _scalar_vec(grid, name, stencil_width)
 
-    zeta_fixed_mask.metadata(0).long_name("tauc_unchanging integer mask")
+    metadata = zeta_fixed_mask.metadata()
+    metadata.long_name("tauc_unchanging integer mask")
     mask_values = [0, 1]
-    zeta_fixed_mask.metadata().set_numbers("flag_values", mask_values)
-    zeta_fixed_mask.metadata().set_string("flag_meanings", "tauc_changable tauc_unchangeable")
+    metadata.set_numbers("flag_values", mask_values)
+    metadata.set_string("flag_meanings", "tauc_changable tauc_unchangeable")
 
     return zeta_fixed_mask
 
@@ -983,10 +994,11 @@ def createLongitudeVec(grid, name="lon", ghost_type=PISM.WITH_GHOSTS, stencil_wi
     stencil_width = _stencil_width(grid, ghost_type, stencil_width)
     longitude = _scalar_vec(grid, name, stencil_width)
 
-    longitude.metadata(0).long_name("longitude").units("degree_east").output_units("degree_east").standard_name("longitude")
+    metadata = longitude.metadata()
+    metadata.long_name("longitude").units("degree_east").output_units("degree_east").standard_name("longitude")
     longitude.time_independent = True
-    longitude.metadata().set_string("coordinates", "")
-    longitude.metadata().set_string("grid_mapping", "")
+    metadata.set_string("coordinates", "")
+    metadata.set_string("grid_mapping", "")
     return longitude
 
 
@@ -1012,8 +1024,9 @@ def createLatitudeVec(grid, name="lat", ghost_type=PISM.WITH_GHOSTS, stencil_wid
 
     latitude = _scalar_vec(grid, name, stencil_width)
 
-    latitude.metadata(0).long_name("latitude").units("degree_north").standard_name("latitude")
+    metadata = latitude.metadata()
+    metadata.long_name("latitude").units("degree_north").standard_name("latitude")
     latitude.time_independent = True
-    latitude.metadata().set_string("coordinates", "")
-    latitude.metadata().set_string("grid_mapping", "")
+    metadata.set_string("coordinates", "")
+    metadata.set_string("grid_mapping", "")
     return latitude
@@ -92,6 +92,15 @@ class Access(object):
             self.comm = None
 
 
+def _fill_random(vec, scale):
+    """Fill the local part of `vec` (including ghosts) with normally distributed
+    random numbers with the standard deviation `scale`."""
+    import numpy as np
+
+    data = vec.local_part()
+    data[...] = np.random.normal(scale=scale, size=data.shape)
+
+
 def randVectorS(grid, scale, stencil_width=None):
     """Create an :cpp:class:`Scalar` of normally distributed random entries.
 
@@ -99,8 +108,6 @@ def randVectorS(grid, scale, stencil_width=None):
       :param scale: Standard deviation of normal distribution.
       :param stencil_width: Ghost stencil width for the vector. Use ``None`` to indicate
                             an unghosted vector.
-
-    This function is not efficiently implemented.
     """
 
     if stencil_width is None:
@@ -110,13 +117,7 @@ def randVectorS(grid, scale, stencil_width=None):
     elif stencil_width == 2:
         rv = PISM.Scalar2(grid, 'rand vec')
 
-    shape = (grid.xm(), grid.ym())
-    import numpy as np
-
-    r = np.random.normal(scale=scale, size=rv.shape())
-    with Access(nocomm=rv):
-        for (i, j) in grid.points():
-            rv[i, j] = r[j - grid.ys(), i - grid.xs()]
+    _fill_random(rv, scale)
 
     if stencil_width is not None:
         rv.update_ghosts()
@@ -131,8 +132,6 @@ def randVectorV(grid, scale, stencil_width=None):
       :param scale: Standard deviation of normal distribution.
       :param stencil_width: Ghost stencil width for the vector. Use ``None`` to indicate
                             an unghosted vector.
-
-    This function is not efficiently implemented.
     """
 
     if stencil_width is None:
@@ -147,14 +146,7 @@ def randVectorV(grid, scale, stencil_width=None):
     else:
         raise ValueError("invalid stencil width: {}".format(stencil_width))
 
-    import numpy as np
-
-    r_u = np.random.normal(scale=scale, size=rv.shape()[:-1])
-    r_v = np.random.normal(scale=scale, size=rv.shape()[:-1])
-    with Access(nocomm=rv):
-        for (i, j) in grid.points():
-            rv[i, j].u = r_u[j - grid.ys(), i - grid.xs()]
-            rv[i, j].v = r_v[j - grid.ys(), i - grid.xs()]
+    _fill_random(rv, scale)
 
     if stencil_width is not None:
         rv.update_ghosts()
@@ -66,8 +66,7 @@ void ColumnInterpolation::coarse_to_fine_linear(const double *input, unsigned in
       continue;
     }
 
-    const double incr = (m_z_fine[k] - m_z_coarse[m]) / (m_z_coarse[m + 1] - m_z_coarse[m]);
-    result[k] = input[m] + incr * (input[m + 1] - input[m]);
+    result[k] = input[m] + m_coarse2fine_weights[k] * (input[m + 1] - input[m]);
   }
 }
 
@@ -135,8 +134,7 @@ void ColumnInterpolation::fine_to_coarse(const double *input, double *result) co
   for (unsigned int k = 0; k < N - 1; ++k) {
     const auto &m = m_fine2coarse[k];
 
-    const double increment = (m_z_coarse[k] - m_z_fine[m]) / (m_z_fine[m + 1] - m_z_fine[m]);
-    result[k] = input[m] + increment * (input[m + 1] - input[m]);
+    result[k] = input[m] + m_fine2coarse_weights[k] * (input[m + 1] - input[m]);
   }
 
   result[N - 1] = input[m_fine2coarse[N - 1]];
@@ -204,13 +202,38 @@ static std::vector<unsigned int> init_interpolation_indexes(const std::vector<do
   return result;
 }
 
+/*!
+ * Compute linear interpolation weights corresponding to indexes computed by
+ * init_interpolation_indexes().
+ *
+ * Sets `result[k]` to `(z_output[k] - z_input[m]) / (z_input[m + 1] - z_input[m])`, where
+ * `m = indexes[k]`, and to zero if `m` is the last index of `z_input`.
+ */
+static std::vector<double> init_interpolation_weights(const std::vector<double>& z_input,
+                                                      const std::vector<double>& z_output,
+                                                      const std::vector<unsigned int>& indexes) {
+  std::vector<double> result(z_output.size(), 0.0);
+
+  for (unsigned int k = 0; k < z_output.size(); ++k) {
+    const unsigned int m = indexes[k];
+
+    if (m + 1 < z_input.size()) {
+      result[k] = (z_output[k] - z_input[m]) / (z_input[m + 1] - z_input[m]);
+    }
+  }
+
+  return result;
+}
+
 void ColumnInterpolation::init_interpolation() {
 
   // coarse -> fine
   m_coarse2fine = init_interpolation_indexes(m_z_coarse, m_z_fine);
+  m_coarse2fine_weights = init_interpolation_weights(m_z_coarse, m_z_fine, m_coarse2fine);
 
   // fine -> coarse
   m_fine2coarse = init_interpolation_indexes(m_z_fine, m_z_coarse);
+  m_fine2coarse_weights = init_interpolation_weights(m_z_fine, m_z_coarse, m_fine2coarse);
 
   // decide if we're going to use linear or quadratic interpolation
   double dz_min = m_z_coarse.back();
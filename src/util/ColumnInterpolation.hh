@@ -51,6 +51,11 @@ private:
   // the coarse grid level just below fine-grid level k (zlevels_fine[k]).
   // Similarly for other arrays below.
   std::vector<unsigned int> m_coarse2fine, m_fine2coarse;
+
+  // Linear interpolation weights corresponding to m_coarse2fine and
+  // m_fine2coarse. These do not depend on the data being interpolated, so we
+  // compute them once to avoid divisions in the per-column code.
+  std::vector<double> m_coarse2fine_weights, m_fine2coarse_weights;
   bool m_use_linear_interpolation;
 
   void init_interpolation();
@@ -15,45 +15,78 @@ import PISM.testing
 import sys
 import os
 import numpy as np
+from contextlib import contextmanager
 from unittest import TestCase, SkipTest
 from PISM.testing import filename
 
 ctx = PISM.Context()
 ctx.log.set_threshold(0)
 
-def create_dummy_grid():
-    "Create a dummy grid"
-    ctx = PISM.Context()
-    Mx = 5
-    Lx = 1e3
+# set PISM_TEST_VERBOSE=1 to see diagnostic output
+VERBOSE = os.environ.get("PISM_TEST_VERBOSE", "0") == "1"
+
+def debug(*args):
+    """Print `args` if VERBOSE is set.
+
+    Arguments are converted to strings in any case to exercise their
+    __str__() and __repr__() methods."""
+    message = " ".join(str(a) for a in args)
+    if VERBOSE:
+        print(message)
+
+# dummy grids shared by tests that do not modify them, keyed by (Mx, Lx)
+_dummy_grids = {}
+
+def create_dummy_grid(Mx=5, Lx=1e3, fresh=False):
+    """Create a dummy grid.
+
+    Grids are cached and shared between tests. Use `fresh=True` to get a
+    new grid in tests that modify it (e.g. add fields to grid.variables()).
+    """
+    key = (Mx, Lx)
+    if not fresh and key in _dummy_grids:
+        return _dummy_grids[key]
+
     params = PISM.GridParameters(ctx.config, Mx, Mx, Lx, Lx)
     params.ownership_ranges_from_options(ctx.config, ctx.size)
-    return PISM.Grid(ctx.ctx, params)
+    grid = PISM.Grid(ctx.ctx, params)
+
+    if not fresh:
+        _dummy_grids[key] = grid
+
+    return grid
+
+@contextmanager
+def empty_file(prefix):
+    "Create an empty NetCDF file with a unique name; remove it on exit."
+    file_name = filename(prefix)
+    try:
+        PISM.File(ctx.com, file_name, PISM.PISM_NETCDF3, PISM.PISM_READWRITE_MOVE).close()
+        yield file_name
+    finally:
+        if os.path.exists(file_name):
+            os.remove(file_name)
 
 
 def context_test():
-    "Test creating a new PISM context"
+    "Test creating a new PISM context and the handling of missing attributes"
     ctx = PISM.Context()
     config = ctx.config
     us = ctx.unit_system
     EC = ctx.enthalpy_converter
 
-
-def context_missing_attribute_test():
-    "Test the handling of missing attributes"
-    ctx = PISM.Context()
     try:
         config = ctx.foo        # there is no "foo", this should fail
-        return False
+        assert False, "failed to detect a missing attribute"
     except AttributeError:
-        return True
+        pass
 
 
 def create_grid_test():
     "Test the creation of the Grid object"
     grid1 = create_dummy_grid()
 
-    grid2 = PISM.model.initGrid(PISM.Context(), 100e3, 100e3, 4000, 11, 11, 21, PISM.CELL_CORNER)
+    grid2 = PISM.model.initGrid(ctx, 100e3, 100e3, 4000, 11, 11, 21, PISM.CELL_CORNER)
 
 
 def algorithm_failure_exception_test():
@@ -69,21 +102,34 @@ def algorithm_failure_exception_test():
 
 def printing_test():
     "Test verbPrintf"
-    ctx = PISM.Context()
     PISM.verbPrintf(1, ctx.com, "hello %s!\n", "world")
 
 
 def random_vec_test():
     "Test methods creating random fields"
-    grid = PISM.Grid.Shallow(PISM.Context().ctx, 1e6, 1e6, 0, 0, 61, 31,
+    grid = PISM.Grid.Shallow(ctx.ctx, 1e6, 1e6, 0, 0, 61, 31,
                              PISM.NOT_PERIODIC, PISM.CELL_CENTER)
 
+    def check(vec, scale):
+        "Check that `vec` contains random values with the standard deviation `scale`"
+        data = vec.to_numpy()
+        if data is None:
+            # the data is gathered on rank 0 only
+            return
+        assert np.any(data != 0.0), "random field is all zeros"
+        np.testing.assert_allclose(np.std(data), scale, rtol=0.2)
+
     vec_scalar = PISM.vec.randVectorS(grid, 1.0)
     vec_vector = PISM.vec.randVectorV(grid, 2.0)
 
     vec_scalar_ghosted = PISM.vec.randVectorS(grid, 1.0, 2)
     vec_vector_ghosted = PISM.vec.randVectorV(grid, 2.0, 2)
 
+    check(vec_scalar, 1.0)
+    check(vec_vector, 2.0)
+    check(vec_scalar_ghosted, 1.0)
+    check(vec_vector_ghosted, 2.0)
+
 
 def vec_metadata_test():
     "Test accessing Array metadata"
@@ -95,7 +141,7 @@ def vec_metadata_test():
 
     m.set_string("units", "kg")
 
-    print(m.get_string("units"))
+    debug(m.get_string("units"))
 
 
 def vars_ownership_test():
@@ -103,15 +149,15 @@ def vars_ownership_test():
     grid = create_dummy_grid()
     variables = PISM.Vars()
 
-    print("Adding 'thk'...")
+    debug("Adding 'thk'...")
     variables.add(PISM.model.createIceThicknessVec(grid))
-    print("Returned from add_thk()...")
+    debug("Returned from add_thk()...")
 
-    print("Getting 'thk' from variables...")
+    debug("Getting 'thk' from variables...")
     thk = variables.get("thk")
-    print(thk)
+    debug(thk)
     thk.begin_access()
-    print("thickness at 0,0 is", thk[0, 0])
+    debug("thickness at 0,0 is", thk[0, 0])
     thk.end_access()
 
 
@@ -168,96 +214,86 @@ def grid_from_file_test():
     finally:
         os.remove(file_name)
 
+# helpers in PISM.model that create standard PISM fields (each takes a grid)
+special_vec_creators = ("createIceSurfaceVec",
+                        "createIceThicknessVec",
+                        "createSeaLevelVec",
+                        "createIceSurfaceStoreVec",
+                        "createIceThicknessStoreVec",
+                        "createBedrockElevationVec",
+                        "createYieldStressVec",
+                        "createStrainHeatingVec",
+                        "createAveragedHardnessVec",
+                        "createEnthalpyVec",
+                        "createAgeVec",
+                        "createBasalMeltRateVec",
+                        "createTillPhiVec",
+                        "createBasalWaterVec",
+                        "createGroundingLineMask",
+                        "create2dVelocityVec",
+                        "createDrivingStressXVec",
+                        "createDrivingStressYVec",
+                        "createVelocityMisfitWeightVec",
+                        "createCBarVec",
+                        "createIceMaskVec",
+                        "createBCMaskVec",
+                        "createNoModelMaskVec",
+                        "createZetaFixedMaskVec",
+                        "createLongitudeVec",
+                        "createLatitudeVec")
+
+def check_special_vec_creator(name, grid):
+    "Call a helper creating a standard PISM field"
+    getattr(PISM.model, name)(grid)
+
+def check_3d_velocity_creator(grid):
+    "Check that create3DVelocityVecs() returns three fields"
+    u, v, w = PISM.model.create3DVelocityVecs(grid)
+
 def create_special_vecs_test():
     "Test helpers used to create standard PISM fields"
     grid = create_dummy_grid()
 
-    usurf = PISM.model.createIceSurfaceVec(grid)
-
-    thk = PISM.model.createIceThicknessVec(grid)
-
-    sea_level = PISM.model.createSeaLevelVec(grid)
+    for name in special_vec_creators:
+        yield check_special_vec_creator, name, grid
 
-    usurfstore = PISM.model.createIceSurfaceStoreVec(grid)
+    yield check_3d_velocity_creator, grid
 
-    thkstore = PISM.model.createIceThicknessStoreVec(grid)
-
-    bed = PISM.model.createBedrockElevationVec(grid)
-
-    tauc = PISM.model.createYieldStressVec(grid)
-
-    strainheat = PISM.model.createStrainHeatingVec(grid)
-
-    u, v, w = PISM.model.create3DVelocityVecs(grid)
-
-    hardav = PISM.model.createAveragedHardnessVec(grid)
-
-    enthalpy = PISM.model.createEnthalpyVec(grid)
-
-    age = PISM.model.createAgeVec(grid)
-
-    bmr = PISM.model.createBasalMeltRateVec(grid)
-
-    tillphi = PISM.model.createTillPhiVec(grid)
-
-    basal_water = PISM.model.createBasalWaterVec(grid)
-
-    gl_mask = PISM.model.createGroundingLineMask(grid)
-
-    vel = PISM.model.create2dVelocityVec(grid)
-
-    taudx = PISM.model.createDrivingStressXVec(grid)
-
-    taudy = PISM.model.createDrivingStressYVec(grid)
-
-    vel_misfit_weight = PISM.model.createVelocityMisfitWeightVec(grid)
-
-    cbar = PISM.model.createCBarVec(grid)
+def modelvecs_add_test():
+    "Test ModelVecs.add() and attribute access"
+    grid = create_dummy_grid(fresh=True)
 
     mask = PISM.model.createIceMaskVec(grid)
 
-    bcmask = PISM.model.createBCMaskVec(grid)
-
-    no_model_mask = PISM.model.createNoModelMaskVec(grid)
-
-    zeta_fixed_mask = PISM.model.createZetaFixedMaskVec(grid)
-
-    lon = PISM.model.createLongitudeVec(grid)
-
-    lat = PISM.model.createLatitudeVec(grid)
-
-    # test ModelVecs.add()
     modeldata = PISM.model.ModelData(grid)
     vecs = modeldata.vecs
 
     vecs.add(mask)
 
-    print(vecs)
+    debug(vecs)
     # test getattr
     vecs.mask
 
-    return True
-
 
 def pism_vars_test():
     """Test adding fields to and getting them from pism::Vars."""
-    grid = create_dummy_grid()
+    grid = create_dummy_grid(fresh=True)
 
     v = grid.variables()
 
     v.add(PISM.model.createIceThicknessVec(grid))
 
     # test getting by short name
-    print(v.get("thk").metadata().get_string("units"))
+    debug(v.get("thk").metadata().get_string("units"))
 
     # test getting by standard name
-    print(v.get("land_ice_thickness").metadata().get_string("units"))
+    debug(v.get("land_ice_thickness").metadata().get_string("units"))
 
 
 def modelvecs_test():
     "Test the ModelVecs class"
 
-    grid = create_dummy_grid()
+    grid = create_dummy_grid(fresh=True)
 
     mask = PISM.model.createIceMaskVec(grid)
     mask.set(PISM.MASK_GROUNDED)
@@ -278,9 +314,9 @@ def modelvecs_test():
         pass
 
     # get a field:
-    print("get() method: ice mask: ", vecs.get("ice_mask").metadata().get_string("long_name"))
+    debug("get() method: ice mask: ", vecs.get("ice_mask").metadata().get_string("long_name"))
 
-    print("dot notation: ice mask: ", vecs.ice_mask.metadata().get_string("long_name"))
+    debug("dot notation: ice mask: ", vecs.ice_mask.metadata().get_string("long_name"))
 
     try:
         vecs.invalid
@@ -297,10 +333,10 @@ def modelvecs_test():
         pass
 
     # test __repr__
-    print(vecs)
+    debug(vecs)
 
     # test has()
-    print("Has thickness?", vecs.has("thickness"))
+    debug("Has thickness?", vecs.has("thickness"))
 
     # test markForWriting
     vecs.markForWriting("ice_mask")
@@ -324,7 +360,6 @@ def modelvecs_test():
 
 def sia_test():
     "Test the PISM.sia module"
-    ctx = PISM.Context()
     Mx = 100
     Lx = 1e5
     params = PISM.GridParameters(ctx.config, Mx, Mx, Lx, Lx)
@@ -367,36 +402,26 @@ def sia_test():
 
 def util_test():
     "Test the PISM.util module"
-    grid = create_dummy_grid()
-
-    output_file = filename("test_pism_util")
-    try:
-        F = PISM.File(grid.com, output_file, PISM.PISM_NETCDF3, PISM.PISM_READWRITE_MOVE)
-        F.close()
 
+    with empty_file("test_pism_util") as output_file:
         PISM.util.writeProvenance(output_file)
         PISM.util.writeProvenance(output_file, message="history string")
 
         PISM.util.fileHasVariable(output_file, "data")
-    finally:
-        os.remove(output_file)
 
     # Test PISM.util.Bunch
     b = PISM.util.Bunch(a=1, b="string")
     b.update(c=3.0)
 
-    print(b.a, b["b"], "b" in b, b)
+    debug(b.a, b["b"], "b" in b, b)
 
 
 def logging_test():
     "Test the PISM.logging module"
-    grid = create_dummy_grid()
 
     import PISM.logging as L
 
-    log_filename = filename("log")
-    try:
-        PISM.File(grid.com, log_filename, PISM.PISM_NETCDF3, PISM.PISM_READWRITE_MOVE)
+    with empty_file("log") as log_filename:
         c = L.CaptureLogger(log_filename)
 
         L.clear_loggers()
@@ -418,33 +443,24 @@ def logging_test():
 
         c.write()                   # default arguments
         c.readOldLog()
-    finally:
-        os.remove(log_filename)
 
-    log_filename = filename("other_log")
-    try:
-        PISM.File(grid.com, log_filename, PISM.PISM_NETCDF3, PISM.PISM_READWRITE_MOVE)
+    with empty_file("other_log") as log_filename:
         c.write(log_filename, "other_log")  # non-default arguments
-    finally:
-        os.remove(log_filename)
 
 
 def column_interpolation_test(plot=False):
     """Test ColumnInterpolation by interpolating from the coarse grid to the
     fine grid and back."""
-    import numpy as np
 
     Lz = 1000.0
     Mz = 41
 
     def z_quadratic(Mz, Lz):
         "Compute levels of a quadratic coarse grid."
-        result = np.zeros(Mz)
         z_lambda = 4.0
-        for k in range(Mz - 1):
-            zeta = float(k) / (Mz - 1)
-            result[k] = Lz * ((zeta / z_lambda) * (1.0 + (z_lambda - 1.0) * zeta))
-        result[Mz - 1] = Lz
+        zeta = np.arange(Mz, dtype=np.float64) / (Mz - 1)
+        result = Lz * ((zeta / z_lambda) * (1.0 + (z_lambda - 1.0) * zeta))
+        result[-1] = Lz
         return result
 
     def fine_grid(z_coarse):
@@ -453,9 +469,8 @@ def column_interpolation_test(plot=False):
         dz = np.min(np.diff(z_coarse))
         Mz = int(np.ceil(Lz / dz) + 1)
         dz = Lz / (Mz - 1.0)
-        result = np.zeros(Mz)
-        for k in range(1, Mz):
-            result[k] = z_coarse[0] + k * dz
+        result = z_coarse[0] + np.arange(Mz) * dz
+        result[0] = 0.0
 
         return result
 
@@ -464,7 +479,7 @@ def column_interpolation_test(plot=False):
         f_coarse = (z_coarse / Lz) ** 2
         z_fine = fine_grid(z_coarse)
 
-        print("Testing quadratic interpolation")
+        debug("Testing quadratic interpolation")
         return test_interp(z_coarse, f_coarse, z_fine, "Quadratic interpolation")
 
     def test_linear_interp():
@@ -472,7 +487,7 @@ def column_interpolation_test(plot=False):
         f_coarse = (z_coarse / Lz) ** 2
         z_fine = fine_grid(z_coarse)
 
-        print("Testing linear interpolation")
+        debug("Testing linear interpolation")
         return test_interp(z_coarse, f_coarse, z_fine, "Linear interpolation")
 
     def test_interp(z, f, z_fine, title):
@@ -496,10 +511,10 @@ def column_interpolation_test(plot=False):
             plt.grid(True)
 
 
-        delta = np.linalg.norm(f - f_roundtrip, ord=1)
-        delta_numpy = np.linalg.norm(f_fine - f_fine_numpy, ord=1)
-        print("norm1(fine_to_coarse(coarse_to_fine(f)) - f) = %f" % delta)
-        print("norm1(PISM - NumPy) = %f" % delta_numpy)
+        delta = np.abs(f - f_roundtrip).sum()
+        delta_numpy = np.abs(f_fine - f_fine_numpy).sum()
+        debug("norm1(fine_to_coarse(coarse_to_fine(f)) - f) = %f" % delta)
+        debug("norm1(PISM - NumPy) = %f" % delta_numpy)
 
         return delta, delta_numpy
 
@@ -537,7 +552,6 @@ def pism_ends_with_test():
 
 def linear_interpolation_test(plot=False):
     "Test linear interpolation code used to regrid fields"
-    import numpy as np
 
     M_in = 11
     M_out = 101
@@ -590,12 +604,12 @@ def pism_context_test():
 
     ctx = PISM.cpp.Context(com, system, config, EC, time, logger, "greenland")
 
-    print(ctx.com().Get_size())
-    print(ctx.config().get_number("constants.standard_gravity"))
-    print(ctx.enthalpy_converter().L(273.15))
-    print(ctx.time().current())
-    print(PISM.convert(ctx.unit_system(), 1, "km", "m"))
-    print(ctx.prefix())
+    debug(ctx.com().Get_size())
+    debug(ctx.config().get_number("constants.standard_gravity"))
+    debug(ctx.enthalpy_converter().L(273.15))
+    debug(ctx.time().current())
+    debug(PISM.convert(ctx.unit_system(), 1, "km", "m"))
+    debug(ctx.prefix())
 
 
 def check_flow_law(factory, flow_law_name, EC, stored_data):
@@ -615,9 +629,9 @@ def check_flow_law(factory, flow_law_name, EC, stored_data):
     Tm = EC.melting_temperature(p)
 
     data = []
-    print("  Flow table for %s" % law.name())
-    print("| Sigma        | Temperature  | Omega        | Flow factor  |")
-    print("|--------------+--------------+--------------+--------------|")
+    debug("  Flow table for %s" % law.name())
+    debug("| Sigma        | Temperature  | Omega        | Flow factor  |")
+    debug("|--------------+--------------+--------------+--------------|")
     for S in sigma:
         for Tpa, O in zip(T_pa, omega):
             T = Tm + Tpa
@@ -625,9 +639,9 @@ def check_flow_law(factory, flow_law_name, EC, stored_data):
             F = law.flow(S, E, p, gs)
             data.append(F)
 
-            print("| %e | %e | %e | %e |" % (S, T, O, F))
-    print("|--------------+--------------+--------------+--------------|")
-    print("")
+            debug("| %e | %e | %e | %e |" % (S, T, O, F))
+    debug("|--------------+--------------+--------------+--------------|")
+    debug("")
 
     data = np.array(data)
 
@@ -677,8 +691,6 @@ def flowlaw_test():
 def ssa_trivial_test():
     "Test the SSA solver using a trivial setup."
 
-    context = PISM.Context()
-
     L = 50.e3  # // 50km half-width
     H0 = 500  # // m
     dhdx = 0.005  # // pure number, slope of surface & bed
@@ -687,11 +699,11 @@ def ssa_trivial_test():
 
     class TrivialSSARun(PISM.ssa.SSAExactTestCase):
         def _initGrid(self):
-            self.grid = PISM.Grid.Shallow(context.ctx, L, L, 0, 0,
+            self.grid = PISM.Grid.Shallow(ctx.ctx, L, L, 0, 0,
                                              self.Mx, self.My, PISM.CELL_CORNER, PISM.NOT_PERIODIC)
 
         def _initPhysics(self):
-            self.modeldata.setPhysics(context.enthalpy_converter)
+            self.modeldata.setPhysics(ctx.enthalpy_converter)
 
         def _initSSACoefficients(self):
             self._allocStdSSACoefficients()
@@ -732,7 +744,7 @@ def ssa_trivial_test():
 def epsg_test():
     "Test EPSG to CF conversion."
     l = PISM.StringLogger(PISM.PETSc.COMM_WORLD, 2)
-    system = PISM.Context().unit_system
+    system = ctx.unit_system
 
     # test supported formats
     for template in ["{epsg}:{code}",
@@ -742,12 +754,12 @@ def epsg_test():
         for epsg in ["EPSG", "epsg"]:
             for code in [3413, 3031, 3057, 5936, 26710]:
                 string = template.format(epsg=epsg, code=code)
-                print("Trying {}".format(string))
+                debug("Trying {}".format(string))
                 l.reset()
                 v = PISM.epsg_to_cf(system, string)
                 v.report_to_stdout(l, 2)
-                print(l.get())
-                print("done.")
+                debug(l.get())
+                debug("done.")
 
     # test that unsupported codes trigger an exception
     try:
@@ -766,9 +778,7 @@ def epsg_test():
 
 def regridding_test():
     "Test 2D regridding: same input and target grids."
-    import numpy as np
 
-    ctx = PISM.Context()
     Mx = 3
     Lx = 1e5
     params = PISM.GridParameters(ctx.config, Mx, Mx, Lx, Lx)
@@ -827,7 +837,7 @@ def interpolation_weights_test():
     Lx = 20
     Ly = 10
 
-    grid = PISM.Grid.Shallow(PISM.Context().ctx,
+    grid = PISM.Grid.Shallow(ctx.ctx,
                              Lx, Ly, 0, 0, Mx, My,
                              PISM.CELL_CORNER,
                              PISM.NOT_PERIODIC)
@@ -852,7 +862,6 @@ def interpolation_weights_test():
 def vertical_extrapolation_during_regridding_test():
     "Test extrapolation in the vertical direction"
     # create a grid with 11 levels, 1000m thick
-    ctx = PISM.Context()
     Mx = 3
     Lx = 1e5
     params = PISM.GridParameters(ctx.config, Mx, Mx, Lx, Lx)
@@ -989,7 +998,7 @@ class PrincipalStrainRates(TestCase):
         return Mx, delta_e1, delta_e2
 
     def setUp(self):
-        self.ctx = PISM.Context()
+        self.ctx = ctx
 
     def test_principal_strain_rates(self):
         "Test principal strain rate computation"
@@ -1458,7 +1467,7 @@ def thickness_calving_test():
 
     geometry.ensure_consistency(0.0)
 
-    config = PISM.Context().config
+    config = ctx.config
 
     filename = PISM.testing.filename("threshold_thickness_")
     day = 86400.0